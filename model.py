@@ -1,7 +1,17 @@
-from pyscipopt import Model, quicksum
+from pyscipopt import (
+    Model,
+    Conshdlr,
+    SCIP_PARAMEMPHASIS,
+    SCIP_PARAMSETTING,
+    SCIP_RESULT,
+    quicksum,
+)
 from enum import Enum
-from typing import List, Dict
+import numpy as np
+from typing import List, Dict, Tuple
 from pyscipopt.scip import Solution, Variable
+import os
+import tempfile
 import unittest
 
 
@@ -14,6 +24,95 @@ class SymetricScheme(Enum):
     MIN_MAX = 5
 
 
+class Tuning(Enum):
+    DEFAULT = 0
+    AGGRESSIVE = 1
+    FEASIBILITY = 2
+
+
+class MinMaxWindowConshdlr(Conshdlr):
+    """
+    Lazy constraint handler for the first MIN_MAX scheme constraint (19).
+
+    Rather than adding one row per pair of teams and window of c + 1 consecutive rounds up front,
+    only the windows in which a candidate solution schedules both matches of a pair are added.
+    """
+
+    def __init__(self, x: np.ndarray, c: int):
+        """
+        Initialize the MinMaxWindowConshdlr class.
+
+        Args:
+                        x (np.ndarray): Decision variable x[i,j,k]
+                        c (int): Parameter c for MIN_MAX scheme
+        """
+        self.x = x
+        self.c = c
+        N, _, self.K = x.shape
+        self.pairs = [(i, j) for i in range(N) for j in range(i + 1, N)]
+        i, j = np.array(self.pairs).T
+        # Both matches of every pair, as one flat list of variables to evaluate.
+        self.__pair_vars = np.stack([x[i, j], x[j, i]]).ravel().tolist()
+
+    def __violated_windows(self, solution=None) -> List[Tuple[int, int, int]]:
+        # Windows (i, j, k) in which i and j meet more than once during rounds k, ..., k + c.
+        get_val = self.model.getSolVal
+        meets = (
+            np.array([get_val(solution, var) for var in self.__pair_vars])
+            .reshape(2, len(self.pairs), self.K)
+            .sum(axis=0)
+        )
+        # Sums over every window of c + 1 rounds from the prefix sums of each pair.
+        prefix = np.zeros((len(self.pairs), self.K + 1))
+        np.cumsum(meets, axis=1, out=prefix[:, 1:])
+        windows = prefix[:, self.c + 1 :] - prefix[:, : self.K - self.c]
+        return [
+            (*self.pairs[p], k) for p, k in np.argwhere(windows > 1 + 1e-6).tolist()
+        ]
+
+    def window_vars(self, i: int, j: int, k: int) -> List[Variable]:
+        # Both matches of i and j during rounds k, ..., k + c.
+        window = slice(k, k + self.c + 1)
+        return self.x[i, j, window].tolist() + self.x[j, i, window].tolist()
+
+    def __enforce(self) -> Dict[str, int]:
+        violated = self.__violated_windows()
+        for i, j, k in violated:
+            # (19) - Min max scheme constraint 1 -  At least c rounds
+            self.model.addCons(
+                quicksum(self.window_vars(i, j, k)) <= 1,
+                f"min_max_1_{i}_{j}_{k}",
+            )
+        if violated:
+            return {"result": SCIP_RESULT.CONSADDED}
+        return {"result": SCIP_RESULT.FEASIBLE}
+
+    def conscheck(
+        self,
+        constraints,
+        solution,
+        checkintegrality,
+        checklprows,
+        printreason,
+        completely,
+    ):
+        if self.__violated_windows(solution):
+            return {"result": SCIP_RESULT.INFEASIBLE}
+        return {"result": SCIP_RESULT.FEASIBLE}
+
+    def consenfolp(self, constraints, nusefulconss, solinfeasible):
+        return self.__enforce()
+
+    def consenfops(self, constraints, nusefulconss, solinfeasible, objinfeasible):
+        return self.__enforce()
+
+    def conslock(self, constraint, locktype, nlockspos, nlocksneg):
+        # Without constraint objects SCIP calls this once for the handler. Every window row
+        # is a <= 1 row with positive coefficients, so rounding a pair variable up may violate it.
+        for var in self.__pair_vars:
+            self.model.addVarLocks(var, nlocksneg, nlockspos)
+
+
 class FootballSchedulerModel:
     """
     Football Scheduler model class. Initializes the model and decision variables, and handles modeling logic.
@@ -31,6 +130,7 @@ class FootballSchedulerModel:
                 x: Decision variable x[i,j,k]
                 y: Decision variable y[i,k]
                 w: Decision variable w[i,k]
+                h: Auxiliary variable h[i,k]
                 model: SCIP model
                 c: Parameter c for MIN_MAX scheme
                 d: Parameter d for MIN_MAX scheme
@@ -44,6 +144,10 @@ class FootballSchedulerModel:
         c: int = 0,
         d: int = 0,
         verbose: bool = False,
+        debug_names: bool = False,
+        tuning: Tuning = Tuning.DEFAULT,
+        break_symmetry: bool = True,
+        n_threads: int = 1,
     ):
         """
         Initialize the FootballScheduler class.
@@ -55,10 +159,14 @@ class FootballSchedulerModel:
                         c (int, optional): Parameter c for MIN_MAX scheme. Defaults to 0.
                         d (int, optional): Parameter d for MIN_MAX scheme. Defaults to 0.
                         verbose (bool,optional): Wether to show model logs. Defaults to False.
+                        debug_names (bool, optional): Wether to name the constraints and auxiliary variables. x is always named as solution recovery relies on it. Defaults to False.
+                        tuning (Tuning, optional): SCIP settings to use. AGGRESSIVE presolves and runs heuristics aggressively, FEASIBILITY aims at finding a schedule fast. Defaults to Tuning.DEFAULT.
+                        break_symmetry (bool, optional): Wether to fix round 0 matches between non top teams and let SCIP handle the remaining symmetries. Defaults to True.
+                        n_threads (int, optional): Number of concurrent solvers to race in optimize. Not used by MIN_MAX, whose lazy constraints can not be copied. Defaults to 1.
         """
         if N % 2 != 0:
             raise ValueError("N is not even")
-        if len(I_s) > 0 and (max(I_s)) > N:
+        if len(I_s) > 0 and (max(I_s)) >= N:
             raise ValueError("I_s must be a subset of teams I")
         if scheme != SymetricScheme.MIN_MAX and (c != 0 or d != 0):
             raise ValueError(
@@ -68,18 +176,42 @@ class FootballSchedulerModel:
             not (1 <= c <= N) or not (c <= d <= 2 * (N - 1))
         ):
             raise ValueError("Invalid values for c and d")
+        if n_threads < 1:
+            raise ValueError("n_threads must be at least 1")
 
         self.N = N
         self.K = 2 * (N - 1)
         self.I_s = I_s
         self.scheme = scheme
 
-        self.x = {}
-        self.y = {}
-        self.w = {}
+        self.__teams = tuple(range(self.N))
+        self.__rounds = tuple(range(self.K))
+        # Double rounds are identified by their first round.
+        self.__double_rounds = tuple(range(0, self.K, 2))
+
+        self.__top = frozenset(I_s)
+        self.__non_top = [i for i in self.__teams if i not in self.__top]
 
         self.__model = Model("Football Scheduler")
-        self.__model.setIntParam("misc/usesymmetry", 0)
+        # SCIP can not see the lazy MIN_MAX constraints when detecting symmetries.
+        if break_symmetry and scheme != SymetricScheme.MIN_MAX:
+            self.__model.setIntParam("misc/usesymmetry", 2)
+        else:
+            self.__model.setIntParam("misc/usesymmetry", 0)
+
+        if tuning == Tuning.AGGRESSIVE:
+            # Aggressive separation is left out as it slows the solve down on these models.
+            self.__model.setPresolve(SCIP_PARAMSETTING.AGGRESSIVE)
+            self.__model.setHeuristics(SCIP_PARAMSETTING.AGGRESSIVE)
+            self.__model.setIntParam("presolving/maxrounds", -1)
+        elif tuning == Tuning.FEASIBILITY:
+            self.__model.setEmphasis(SCIP_PARAMEMPHASIS.FEASIBILITY)
+
+        # Concurrent solvers work on copies, which would lose the MIN_MAX constraint handler.
+        self.__concurrent = n_threads > 1 and scheme != SymetricScheme.MIN_MAX
+        if self.__concurrent:
+            self.__model.setIntParam("parallel/maxnthreads", n_threads)
+            self.__model.setIntParam("parallel/minnthreads", n_threads)
 
         if not verbose:
             self.__model.hideOutput()
@@ -91,9 +223,25 @@ class FootballSchedulerModel:
         self.c = c
         self.d = d
 
+        self.__debug_names = debug_names
+        self.__symmetry_fixings = self.__symmetry_breaking_matches(break_symmetry)
+
+        self.__round_pairs_builders = {
+            SymetricScheme.MIRRORED: self.__mirrored_round_pairs,
+            SymetricScheme.FRENCH: self.__french_round_pairs,
+            SymetricScheme.ENGLISH: self.__english_round_pairs,
+            SymetricScheme.INVERTED: self.__inverted_round_pairs,
+            SymetricScheme.BACK_TO_BACK: self.__back_to_back_round_pairs,
+        }
+        self.__scheme_constraints_builders = {
+            SymetricScheme.MIN_MAX: self.__instance_min_max_constraints,
+        }
+
         self.__instance_vars()
         self.__instance_constraints()
         self.__set_objective()
+        self.__add_symmetry_breaking()
+        self.__add_warm_start()
 
     def __ensure_status(self, status: str):
         current_status = self.__model.getStatus()
@@ -107,27 +255,101 @@ class FootballSchedulerModel:
         Define the decision variables
 
         Variables:
-                        x[i,j,k] = 1 if team i plays against team j in round k.
-                        y[i,k] = 1 if team i has an H-A sequence in the doubleround that start at round k.
-                        w[i,k] = 1 if team i has an away break in the double round starting in round k.
+                        x[i,j,k] = 1 if team i plays against team j in round k. x[i,i,k] is the constant 0.
+                        y[i,k] = 1 if team i has an H-A sequence in the doubleround that start at round k. Constant 0 for odd k.
+                        w[i,k] = 1 if team i has an away break in the double round starting in round k. Constant 0 for odd k.
+                        h[i,k] = 1 if team i plays at home in round k.
         """
-        for i in range(self.N):
-            for j in range(self.N):
-                for k in range(self.K):
-                    self.x[i, j, k] = self.__model.addVar(
-                        vtype="B", name=f"x_{i}_{j}_{k}"
-                    )
+        self.__round_pairs = self.__scheme_round_pairs()
+        tied_rounds = {k2 for _, k2 in self.__round_pairs}
+
+        add_var = self.__model.addVar
+        # Teams never face themselves, so the diagonal holds a constant 0 which
+        # lets sums over a whole row or column skip the i != j guard.
+        self.x = np.fromiter(
+            (
+                (
+                    add_var(vtype="B", name=f"x_{i}_{j}_{k}")
+                    if i != j and k not in tied_rounds
+                    else 0.0
+                )
+                for i in self.__teams
+                for j in self.__teams
+                for k in self.__rounds
+            ),
+            dtype=object,
+            count=self.N * self.N * self.K,
+        ).reshape(self.N, self.N, self.K)
+        # x[j,i,k2] is the very same variable as x[i,j,k] for tied rounds.
+        for k, k2 in self.__round_pairs:
+            self.x[:, :, k2] = self.x[:, :, k].T
+
+        # y and w only take part in constraints for the first round of each double round.
+        self.y = self.__instance_team_round_vars("y", self.__double_rounds)
+        self.w = self.__instance_team_round_vars("w", self.__double_rounds)
+        self.h = self.__instance_team_round_vars("h", self.__rounds)
+
+    def __scheme_round_pairs(self) -> List[Tuple[int, int]]:
+        """
+        Define the rounds tied by the symmetric scheme
 
-        for i in range(self.N):
-            for k in range(self.K):
-                self.y[i, k] = self.__model.addVar(vtype="B", name=f"y_{i}_{k}")
-                self.w[i, k] = self.__model.addVar(vtype="B", name=f"w_{i}_{k}")
+        Pairs:
+                        (k, k2) such that x[i,j,k] = x[j,i,k2] for every pair of teams i != j.
+        """
+        # (19) - Min max scheme constraints are not equalities.
+        return self.__round_pairs_builders.get(self.scheme, list)()
+
+    def __mirrored_round_pairs(self) -> List[Tuple[int, int]]:
+        # (14) - Mirror scheme constraint
+        return [(k, k + self.N - 1) for k in range(self.N - 1)]
+
+    def __french_round_pairs(self) -> List[Tuple[int, int]]:
+        # (15) - French scheme constraints 1 and 2
+        N = self.N
+        return [(0, 2 * N - 3)] + [(k, k + N - 2) for k in range(1, N - 1)]
+
+    def __english_round_pairs(self) -> List[Tuple[int, int]]:
+        # (16) - English scheme constraints 1 and 2
+        N = self.N
+        return [(N - 2, N - 1)] + [(k, k + N) for k in range(1, N - 2)]
+
+    def __inverted_round_pairs(self) -> List[Tuple[int, int]]:
+        # (17) - Inverted scheme constraint
+        return [(k, 2 * (self.N - 1) - 1 - k) for k in range(self.N - 2)]
+
+    def __back_to_back_round_pairs(self) -> List[Tuple[int, int]]:
+        # (18) - Back to back scheme constraint
+        return [(k, k + 1) for k in self.__double_rounds]
+
+    def __instance_team_round_vars(
+        self, prefix: str, rounds: Tuple[int, ...]
+    ) -> np.ndarray:
+        add_var = self.__model.addVar
+        # Rounds outside of rounds hold a constant 0.
+        rounds = set(rounds)
+        return np.fromiter(
+            (
+                (
+                    add_var(
+                        vtype="B",
+                        name=f"{prefix}_{i}_{k}" if self.__debug_names else "",
+                    )
+                    if k in rounds
+                    else 0.0
+                )
+                for i in self.__teams
+                for k in self.__rounds
+            ),
+            dtype=object,
+            count=self.N * self.K,
+        ).reshape(self.N, self.K)
 
     def __instance_constraints(self):
         """
         Define the model constraints
 
         Constraints:
+                        - Home indicator
                         - Double round robin
                         - Compactness
                         - Top-teams
@@ -135,6 +357,7 @@ class FootballSchedulerModel:
                         - Aux Vars
                         - Symmetric scheme
         """
+        self.__instance_home_constraints()
         # b2b is uncompatible with double round robin constraints.
         if self.scheme != SymetricScheme.BACK_TO_BACK:
             self.__instance_double_round_robin_constraints()
@@ -146,269 +369,297 @@ class FootballSchedulerModel:
             self.__instance_top_teams_constraints()
         # mirrored is uncompatible with most constraints.
         if self.scheme != SymetricScheme.MIRRORED:
-            self.__instance_balance_constraints()
-            self.__instance_aux_var_constraints()
+            self.__instance_balance_and_aux_var_constraints()
         self.__instance_symmetric_scheme_constraints()
 
+    def __instance_home_constraints(self):
+        # Home indicator constraints
+        add_cons = self.__model.addCons
+        for i in self.__teams:
+            for k in self.__rounds:
+                # h[i,k] counts the home matches of team i in round k.
+                add_cons(
+                    quicksum(self.x[i, :, k].tolist()) == self.h[i, k],
+                    name=f"home_{i}_{k}" if self.__debug_names else "",
+                )
+
     def __instance_double_round_robin_constraints(self):
         # Double round robin constraints.
-        for i in range(self.N):
-            for j in range(self.N):
-                if i == j:
-                    continue
+        # (1) and (2) are symmetric in i, j so they are only added once per pair. As together they
+        # make i and j meet twice, (3) for i, j implies (3) for j, i and is also added once per pair.
+        # When every round of the second half is tied to one of the first, x aliasing turns
+        # (2) and (3) into (1), so only (1) is added.
+        second_half = sorted(k2 for k, k2 in self.__round_pairs if k < self.N - 1)
+        only_first_half = second_half == list(range(self.N - 1, self.K))
+        add_cons = self.__model.addCons
+        for i in self.__teams:
+            for j in range(i + 1, self.N):
                 # (1) - every team faces every other team once in the first half
-                self.__model.addCons(
+                add_cons(
                     quicksum(
-                        self.x[i, j, k] + self.x[j, i, k] for k in range(self.N - 1)
+                        self.x[i, j, : self.N - 1].tolist()
+                        + self.x[j, i, : self.N - 1].tolist()
                     )
                     == 1,
-                    name=f"match_first_half_{i}_{j}",
+                    name=f"match_first_half_{i}_{j}" if self.__debug_names else "",
                 )
+                if only_first_half:
+                    continue
                 # (2) - every team faces every other team once in the second half
-                self.__model.addCons(
+                add_cons(
                     quicksum(
-                        self.x[i, j, k] + self.x[j, i, k]
-                        for k in range(self.N - 1, self.K)
+                        self.x[i, j, self.N - 1 :].tolist()
+                        + self.x[j, i, self.N - 1 :].tolist()
                     )
                     == 1,
-                    name=f"match_second_half_{i}_{j}",
+                    name=f"match_second_half_{i}_{j}" if self.__debug_names else "",
                 )
                 # (3) - exactly one of the two games is played at home while the other one is played away
-                self.__model.addCons(
-                    quicksum(self.x[i, j, k] for k in range(self.K)) == 1,
-                    name=f"not_two_home_{i}_{j}",
+                add_cons(
+                    quicksum(self.x[i, j].tolist()) == 1,
+                    name=f"not_two_home_{i}_{j}" if self.__debug_names else "",
                 )
 
     def __instance_relaxed_double_round_robin_constraints(self):
         # Relaxe Double round robin constraints for Back-to-back scheme.
-        for i in range(self.N):
-            for j in range(self.N):
-                if i == j:
-                    continue
+        add_cons = self.__model.addCons
+        for i in self.__teams:
+            # x[:, :, k + 1] aliases x[:, :, k].T, so (3) for (j, i) is the same row.
+            for j in range(i + 1, self.N):
                 # (3) - exactly one of the two games is played at home while the other one is played away
-                self.__model.addCons(
-                    quicksum(self.x[i, j, k] for k in range(self.K)) == 1,
-                    name=f"r_not_two_home_{i}_{j}",
+                add_cons(
+                    quicksum(self.x[i, j].tolist()) == 1,
+                    name=f"r_not_two_home_{i}_{j}" if self.__debug_names else "",
                 )
 
     def __instance_compactness_constraints(self):
         # Compactness constraints
-        for j in range(self.N):
-            for k in range(self.K):
+        add_cons = self.__model.addCons
+        for j in self.__teams:
+            for k in self.__rounds:
                 # (4) - all teams must play one match in each round.
-                self.__model.addCons(
-                    quicksum(
-                        self.x[i, j, k] + self.x[j, i, k]
-                        for i in range(self.N)
-                        if i != j
-                    )
-                    == 1,
-                    name=f"one_match_per_round_{j}_{k}",
+                add_cons(
+                    self.h[j, k] + quicksum(self.x[:, j, k].tolist()) == 1,
+                    name=f"one_match_per_round_{j}_{k}" if self.__debug_names else "",
                 )
 
     def __instance_top_teams_constraints(self):
         # Top-teams constraints
-        for i in [x for x in range(self.N) if x not in self.I_s]:
+        add_cons = self.__model.addCons
+        for i in self.__non_top:
             for k in range(self.K - 1):
                 # (5) - No non-top team be required to play against any of the top teams in consecutive matches.
-                self.__model.addCons(
+                add_cons(
                     quicksum(
-                        self.x[i, j, k]
-                        + self.x[j, i, k]
-                        + self.x[i, j, k + 1]
-                        + self.x[j, i, k + 1]
-                        for j in self.I_s
+                        self.x[i, self.I_s, k : k + 2].ravel().tolist()
+                        + self.x[self.I_s, i, k : k + 2].ravel().tolist()
                     )
                     <= 1,
-                    name=f"top_team_cons_{i}_{k}",
+                    name=f"top_team_cons_{i}_{k}" if self.__debug_names else "",
                 )
 
-    def __instance_balance_constraints(self):
-        # Balance constraints
-        for i in range(self.N):
+    def __instance_balance_and_aux_var_constraints(self):
+        # Balance and aux constraints, built in a single pass over the double rounds.
+        # By (4) team i plays away in round k iff h[i,k] = 0.
+        add_cons = self.__model.addCons
+        h, y, w = self.h, self.y, self.w
+        for i in self.__teams:
             # (6) - Each team has bewteen N/2-1 and N/2 H-A sequences in double rounds.
-            self.__model.addCons(
-                quicksum(self.y[i, k] for k in range(0, self.K, 2))
-                >= (self.N // 2) - 1,
-                name=f"bound_below_HA_seq_{i}",
+            add_cons(
+                quicksum(y[i, ::2].tolist()) >= (self.N // 2) - 1,
+                name=f"bound_below_HA_seq_{i}" if self.__debug_names else "",
             )
-            self.__model.addCons(
-                quicksum(self.y[i, k] for k in range(0, self.K, 2)) <= (self.N // 2),
-                name=f"bound_above_HA_seq_{i}",
+            add_cons(
+                quicksum(y[i, ::2].tolist()) <= (self.N // 2),
+                name=f"bound_above_HA_seq_{i}" if self.__debug_names else "",
             )
 
-            for k in range(0, self.K, 2):
+            for k in self.__double_rounds:
+                h_k, h_k1 = h[i, k], h[i, k + 1]
                 # (7) - Teams should not play consecutive home or away matches in double rounds.
-                self.__model.addCons(
-                    quicksum(
-                        self.x[i, j, k] + self.x[j, i, k + 1]
-                        for j in range(self.N)
-                        if j != i
-                    )
-                    <= 1 + self.y[i, k],
-                    name=f"HA_{i}_{k}",
+                add_cons(
+                    h_k - h_k1 <= y[i, k],
+                    name=f"HA_{i}_{k}" if self.__debug_names else "",
                 )
                 # (8) - No more H-A sequences than played games in round k
-                self.__model.addCons(
-                    quicksum(self.x[i, j, k] for j in range(self.N) if j != i)
-                    >= self.y[i, k],
-                    name=f"c8_{i}_{k}",
+                add_cons(
+                    h_k >= y[i, k],
+                    name=f"c8_{i}_{k}" if self.__debug_names else "",
                 )
                 # (9) - No more H-A sequences than played games in round k + 1
-                self.__model.addCons(
-                    quicksum(self.x[j, i, k + 1] for j in range(self.N) if j != i)
-                    >= self.y[i, k],
-                    name=f"c9_{i}_{k}",
+                add_cons(
+                    1 - h_k1 >= y[i, k],
+                    name=f"c9_{i}_{k}" if self.__debug_names else "",
                 )
-
-    def __instance_aux_var_constraints(self):
-        # Aux constraints
-        for i in range(self.N):
-            for k in range(0, self.K, 2):
                 # (10) - Teams should not have two consecutive away breaks
-                self.__model.addCons(
-                    quicksum(
-                        self.x[j, i, k] + self.x[j, i, k + 1]
-                        for j in range(self.N)
-                        if j != i
-                    )
-                    <= 1 + self.w[i, k],
-                    name=f"AB_{i}_{k}",
+                add_cons(
+                    h_k + h_k1 + w[i, k] >= 1,
+                    name=f"AB_{i}_{k}" if self.__debug_names else "",
                 )
                 # (11) - No more away breaks sequences than played games in round k
-                self.__model.addCons(
-                    quicksum(self.x[j, i, k] for j in range(self.N) if j != i)
-                    >= self.w[i, k],
-                    name=f"c11_{i}_{k}",
+                add_cons(
+                    1 - h_k >= w[i, k],
+                    name=f"c11_{i}_{k}" if self.__debug_names else "",
                 )
                 # (12) - No more away breaks sequences than played games in round k + 1
-                self.__model.addCons(
-                    quicksum(self.x[j, i, k + 1] for j in range(self.N) if j != i)
-                    >= self.w[i, k],
-                    name=f"c12_{i}_{k}",
+                add_cons(
+                    1 - h_k1 >= w[i, k],
+                    name=f"c12_{i}_{k}" if self.__debug_names else "",
                 )
 
     def __instance_symmetric_scheme_constraints(self):
-        if self.scheme == SymetricScheme.MIRRORED:
-            for i in range(self.N):
-                for j in range(self.N):
-                    if i == j:
-                        continue
-                    for k in range(self.N - 1):
-                        # (14) - Mirror scheme constraint
-                        self.__model.addCons(
-                            self.x[i, j, k] == self.x[j, i, k + self.N - 1],
-                            f"mirrored_{i}_{j}_{k}",
-                        )
-
-        elif self.scheme == SymetricScheme.FRENCH:
-            for i in range(self.N):
-                for j in range(self.N):
-                    if i == j:
-                        continue
-                    # (15) - French scheme constraint 1
-                    self.__model.addCons(
-                        self.x[i, j, 0] == self.x[j, i, 2 * self.N - 3],
-                        f"french_1_{i}_{j}",
-                    )
-                    for k in range(1, self.N - 1):
-                        # (15) - French scheme constraint 2
-                        self.__model.addCons(
-                            self.x[i, j, k] == self.x[j, i, k + self.N - 2],
-                            f"french_2_{i}_{j}_{k}",
+        # Schemes other than MIN_MAX are enforced by aliasing x, see __scheme_round_pairs.
+        self.__scheme_constraints_builders.get(self.scheme, lambda: None)()
+
+    def __instance_min_max_constraints(self):
+        # (19) - Min max scheme constraint 1 is only added when violated.
+        self.__min_max_window = MinMaxWindowConshdlr(self.x, self.c)
+        self.__model.includeConshdlr(
+            self.__min_max_window,
+            "min_max_window",
+            "MIN_MAX scheme minimum separation between matches of a pair",
+            enfopriority=-1,
+            chckpriority=-1,
+            needscons=False,
+        )
+        # Rounds within d of round k and the remaining ones, which only depend on k.
+        windows = [
+            [q for q in range(max(k - self.d, 0), min(k + self.d, self.K)) if q != k]
+            for k in self.__rounds
+        ]
+        outside = [
+            [q for q in self.__rounds if q != k and q not in windows[k]]
+            for k in self.__rounds
+        ]
+        x = self.x
+        add_cons = self.__model.addCons
+        for i in self.__teams:
+            for j in self.__teams:
+                if i == j:
+                    continue
+                for k in self.__rounds:
+                    # (19) - Min max scheme constraint 2 - At much d rounds
+                    if len(windows[k]) <= len(outside[k]):
+                        cons = quicksum(x[i, j, windows[k]].tolist()) >= x[j, i, k]
+                    elif outside[k]:
+                        # As i hosts j exactly once by (3), this is the same row over the shorter complement.
+                        cons = (
+                            x[j, i, k]
+                            + x[i, j, k]
+                            + quicksum(x[i, j, outside[k]].tolist())
+                            <= 1
                         )
-
-        elif self.scheme == SymetricScheme.ENGLISH:
-            for i in range(self.N):
-                for j in range(self.N):
-                    if i == j:
+                    else:
+                        # The window holds every other round so the row is implied by (3) and (4).
                         continue
-                    # (16) - English scheme constraint 1
-                    self.__model.addCons(
-                        self.x[i, j, self.N - 2] == self.x[j, i, self.N - 1],
-                        f"english_1_{i}_{j}",
+                    add_cons(
+                        cons,
+                        name=f"min_max_2_{i}_{j}_{k}" if self.__debug_names else "",
                     )
-                    for k in range(1, self.N - 2):
-                        # (16) - English scheme constraint 2
-                        self.__model.addCons(
-                            self.x[i, j, k] == self.x[j, i, k + self.N],
-                            f"english_2_{i}_{j}_{k}",
-                        )
-
-        elif self.scheme == SymetricScheme.INVERTED:
-            for i in range(self.N):
-                for j in range(self.N):
-                    if i == j:
-                        continue
-                    for k in range(self.N - 2):
-                        # (17) - Inverted scheme constraint
-                        self.__model.addCons(
-                            self.x[i, j, k] == self.x[j, i, 2 * (self.N - 1) - 1 - k],
-                            f"inverted_{i}_{j}_{k}",
-                        )
-
-        elif self.scheme == SymetricScheme.BACK_TO_BACK:
-            for i in range(self.N):
-                for j in range(self.N):
-                    if i == j:
-                        continue
-                    for k in range(0, self.K - 1, 2):
-                        # (18) - Back to back scheme constraint
-                        self.__model.addCons(
-                            self.x[i, j, k] == self.x[j, i, k + 1],
-                            f"back_to_back_{i}_{j}_{k}",
-                        )
-
-        elif self.scheme == SymetricScheme.MIN_MAX:
-            for i in range(self.N):
-                for j in range(self.N):
-                    if i == j:
-                        continue
-                    for k in range(0, self.K - self.c):
-                        # (19) - Min max scheme constraint 1 -  At least c rounds
-                        self.__model.addCons(
-                            quicksum(
-                                self.x[i, j, q] + self.x[j, i, q]
-                                for q in range(k, k + self.c + 1)
-                            )
-                            <= 1,
-                            f"min_max_1_{i}_{j}_{k}",
-                        )
-                    for k in range(0, self.K):
-                        # (19) - Min max scheme constraint 2 - At much d rounds
-                        self.__model.addCons(
-                            quicksum(
-                                self.x[i, j, q]
-                                for q in range(
-                                    max(k - self.d, 0),
-                                    min(k + self.d, 2 * (self.N - 1)),
-                                )
-                                if q != k
-                            )
-                            >= self.x[j, i, k],
-                            f"min_max_2_{i}_{j}_{k}",
-                        )
-
-        else:
-            pass
 
     def __set_objective(self):
         # (13) - Minimize the total number of away breaks within double rounds across all teams.
         self.__model.setObjective(
-            quicksum(self.w[i, k] for k in range(0, self.K, 2) for i in range(self.N)),
+            quicksum(self.w[:, ::2].ravel().tolist()),
             sense="minimize",
         )
 
+    def __symmetry_breaking_matches(
+        self, break_symmetry: bool
+    ) -> List[Tuple[int, int]]:
+        """
+        Pick the matches that can be fixed in round 0 without losing optimal solutions.
+
+        Non top teams are interchangeable. Each top team meets at most one of them in round 0,
+        so at least (|non top| - |top|) / 2 matches of round 0 are between non top teams and the
+        teams can be relabeled to make them the matches of consecutive non top teams.
+
+        Returns:
+                        List[Tuple[int, int]]: The (home, away) matches to fix.
+        """
+        if not break_symmetry:
+            return []
+        n_fixed = (len(self.__non_top) - len(self.__top)) // 2
+        return [
+            (self.__non_top[2 * m], self.__non_top[2 * m + 1]) for m in range(n_fixed)
+        ]
+
+    def __add_symmetry_breaking(self):
+        add_cons = self.__model.addCons
+        for home, away in self.__symmetry_fixings:
+            add_cons(
+                self.x[home, away, 0] == 1,
+                name=f"symmetry_{home}_{away}" if self.__debug_names else "",
+            )
+
+    def __circle_method_schedule(self) -> List[List[Tuple[int, int]]]:
+        """
+        Build a single round robin with the circle method
+
+        Team N-1 stays fixed while the other teams rotate around it.
+
+        Returns:
+                        List[List[Tuple[int, int]]]: The (home, away) matches of each of the N-1 rounds.
+        """
+        n = self.N - 1
+        rounds = []
+        for k in range(n):
+            matches = [(k, n) if k % 2 == 0 else (n, k)]
+            for m in range(1, self.N // 2):
+                a, b = (k + m) % n, (k - m) % n
+                matches.append((a, b) if m % 2 == 0 else (b, a))
+            rounds.append(matches)
+        return rounds
+
+    def __add_warm_start(self):
+        # Other schemes leave rounds untied and their balance constraints (6) reject the
+        # home and away pattern of the circle method.
+        if self.scheme not in (SymetricScheme.MIRRORED, SymetricScheme.BACK_TO_BACK):
+            return
+        # The circle schedule mostly has some non-top team face top teams in consecutive rounds,
+        # which (5) forbids.
+        if self.scheme == SymetricScheme.MIRRORED and self.__top:
+            return
+        rounds = self.__circle_method_schedule()
+        # Relabel the teams so the first matches of round 0 are the fixed ones.
+        label = list(self.__teams)
+        for match, fixing in zip(rounds[0], self.__symmetry_fixings):
+            for team, fixed in zip(match, fixing):
+                t = label.index(fixed)
+                label[team], label[t] = label[t], label[team]
+        sol = self.__model.createSol()
+        at_home = np.zeros((self.N, self.K), dtype=bool)
+        # Each circle round is played in round k and reversed in its tied round k2.
+        for (k, k2), matches in zip(self.__round_pairs, rounds):
+            for home, away in matches:
+                home, away = label[home], label[away]
+                for r, i, j in ((k, home, away), (k2, away, home)):
+                    self.__model.setSolVal(sol, self.x[i, j, r], 1.0)
+                    self.__model.setSolVal(sol, self.h[i, r], 1.0)
+                    at_home[i, r] = True
+        # Back to back double rounds are H-A or A-H, so there are no away breaks to set in w.
+        if self.scheme == SymetricScheme.BACK_TO_BACK:
+            for i in self.__teams:
+                for k in self.__double_rounds:
+                    if at_home[i, k]:
+                        self.__model.setSolVal(sol, self.y[i, k], 1.0)
+        # SCIP checks the solution and discards it if it is not feasible.
+        self.__model.addSol(sol, free=True)
+
     def get_vars(self) -> List[Variable]:
         return self.__model.getVars()
 
     def presolve(self):
         self.__model.presolve()
-        if self.__model.getStatus == "infeasible":
+        if self.__model.getStatus() == "infeasible":
             raise RuntimeError(f"Model is infeasible")
 
     def optimize(self):
-        self.__model.optimize()
+        if self.__concurrent:
+            # Falls back to optimize if SCIP was built without a parallel interface.
+            self.__model.solveConcurrent()
+        else:
+            self.__model.optimize()
         self.__ensure_status("optimal")
 
     def get_obj_value(self) -> int:
@@ -428,12 +679,38 @@ class FootballSchedulerModel:
         return self.__model.getSolvingTime()
 
     def write_problem(self, path: str):
-        self.__model.writeProblem(path)
+        if self.scheme != SymetricScheme.MIN_MAX:
+            self.__model.writeProblem(path)
+            return
+        # (19) - Min max scheme constraint 1 lives in MinMaxWindowConshdlr, which problem files
+        # can not express. Write a copy of the original problem with every window row instead.
+        model = Model(sourceModel=self.__model, origcopy=True)
+        model.hideOutput()
+        copied = {var.name: var for var in model.getVars()}
+        window = self.__min_max_window
+        for i, j in window.pairs:
+            for k in range(self.K - self.c):
+                model.addCons(
+                    quicksum(copied[var.name] for var in window.window_vars(i, j, k))
+                    <= 1,
+                    name=f"min_max_1_{i}_{j}_{k}" if self.__debug_names else "",
+                )
+        model.writeProblem(path)
 
     def write_sol(self, path: str):
         self.__ensure_status("optimal")
         sol = self.get_best_sol()
         self.__model.writeSol(sol, filename=path)
+        # Tied rounds share their variables with the rounds they mirror, so
+        # SCIP does not list them. Append them to recover the whole fixture.
+        with open(path, "a") as f:
+            for k, k2 in self.__round_pairs:
+                for i in self.__teams:
+                    for j in self.__teams:
+                        if i == j or self.__model.getSolVal(sol, self.x[i, j, k]) < 0.5:
+                            continue
+                        name = f"x_{j}_{i}_{k2}"
+                        f.write(f"{name:<52}1 \t(obj:0)\n")
 
 
 class TestFootballSchedulerModel(unittest.TestCase):
@@ -444,6 +721,54 @@ class TestFootballSchedulerModel(unittest.TestCase):
     def test_instance_top_teams(self):
         _ = FootballSchedulerModel(10, SymetricScheme.MIRRORED, [1, 2])
 
+    def test_top_teams_out_of_range(self):
+        with self.assertRaises(ValueError):
+            _ = FootballSchedulerModel(10, SymetricScheme.MIRRORED, [1, 10])
+
+    def test_mirrored_is_feasible(self):
+        model = FootballSchedulerModel(10, SymetricScheme.MIRRORED)
+        model.optimize()
+        self.assertEqual(model.get_obj_value(), 0)
+
+    def test_mirrored_write_sol_lists_every_match(self):
+        model = FootballSchedulerModel(6, SymetricScheme.MIRRORED)
+        model.optimize()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "solution.sol")
+            model.write_sol(path)
+            with open(path, "r") as f:
+                matches = [line for line in f if line.startswith("x_")]
+        self.assertEqual(len(matches), 6 * 5)
+
+    def test_concurrent_mirrored_is_feasible(self):
+        model = FootballSchedulerModel(6, SymetricScheme.MIRRORED, n_threads=2)
+        model.optimize()
+        self.assertEqual(model.get_obj_value(), 0)
+
+    def test_feasibility_tuning_is_feasible(self):
+        model = FootballSchedulerModel(
+            10, SymetricScheme.BACK_TO_BACK, [1, 2], tuning=Tuning.FEASIBILITY
+        )
+        model.optimize()
+        self.assertEqual(model.get_obj_value(), 0)
+
+    def test_symmetry_breaking_fixes_non_top_matches(self):
+        model = FootballSchedulerModel(10, SymetricScheme.MIRRORED, [1, 2])
+        model.optimize()
+        for i, j in [(0, 3), (4, 5), (6, 7)]:
+            self.assertEqual(round(model.get_value(model.x[i, j, 0])), 1)
+
+    def test_mirrored_warm_start_solves_presolve(self):
+        # Presolve alone finds no schedule, so an optimum comes from the warm start.
+        model = FootballSchedulerModel(10, SymetricScheme.MIRRORED)
+        model.presolve()
+        self.assertEqual(model.get_obj_value(), 0)
+
+    def test_back_to_back_warm_start_solves_presolve(self):
+        model = FootballSchedulerModel(10, SymetricScheme.BACK_TO_BACK, [1, 2])
+        model.presolve()
+        self.assertEqual(model.get_obj_value(), 0)
+
     def test_instance_french(self):
         _ = FootballSchedulerModel(10, SymetricScheme.FRENCH)
 
@@ -483,6 +808,44 @@ class TestFootballSchedulerModel(unittest.TestCase):
         model = FootballSchedulerModel(10, SymetricScheme.MIN_MAX, [1, 2], c=5, d=13)
         model.presolve()
 
+    def __fix_min_max_basic_schedule(self, c: int) -> FootballSchedulerModel:
+        # The stored schedule meets every pair at least 6 rounds apart.
+        model = FootballSchedulerModel(
+            10, SymetricScheme.MIN_MAX, c=c, d=13, break_symmetry=False
+        )
+        scip = model._FootballSchedulerModel__model
+        path = os.path.join(
+            os.path.dirname(__file__), "output", "min-max-basic", "solution.sol"
+        )
+        with open(path, "r") as f:
+            for line in f:
+                if line.startswith("x_") and float(line.split()[1]) > 0.5:
+                    i, j, k = map(int, line.split()[0].split("_")[1:])
+                    scip.chgVarLb(model.x[i, j, k], 1)
+        return model
+
+    def test_min_max_accepts_separated_schedule(self):
+        model = self.__fix_min_max_basic_schedule(5)
+        model.optimize()
+        self.assertEqual(model.get_obj_value(), 0)
+
+    def test_min_max_rejects_close_matches(self):
+        model = self.__fix_min_max_basic_schedule(8)
+        with self.assertRaises(RuntimeError):
+            model.optimize()
+
+    def test_min_max_write_problem_lists_window_constraints(self):
+        model = FootballSchedulerModel(
+            6, SymetricScheme.MIN_MAX, c=2, d=8, debug_names=True
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.lp")
+            model.write_problem(path)
+            with open(path, "r") as f:
+                rows = [line for line in f if line.lstrip().startswith("min_max_1_")]
+        # One row per unordered pair and window start.
+        self.assertEqual(len(rows), 15 * (10 - 2))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from typing import Dict, Callable, List
 
@@ -7,17 +8,13 @@ def parse_sol(sol_path: str) -> Dict[str, float]:
     Generates var -> val map given a lp solution.
     """
     d = dict()
-    with open(sol_path, "r") as f:
+    # Lines are "var val (obj:c)". Only the names of x variables are decoded.
+    with open(sol_path, "rb", buffering=1 << 20) as f:
         for line in f:
-            line = line.strip()
-            if (
-                not line
-                or line.startswith("objective value")
-                or not line.startswith("x_")
-            ):
+            if line[:2] != b"x_":
                 continue
-            var, val, _ = line.split()
-            d[var] = float(val)
+            var, val, _ = line.split(None, 2)
+            d[var.decode()] = float(val)
     return d
 
 
@@ -33,17 +30,24 @@ def to_df(
                 - sol (Dict[str, float]): Obtained via `parse_sol`
 
     """
-    data = dict()
-    data["Team"] = [x for x in range(n)]
-    for i in range(2 * (n - 1)):
-        data[str(i)] = ["" for _ in range(n)]
-    for var, val in sol.items():
-        if not var.startswith("x_") or val == 0:
-            continue
-        _, i, j, k = var.split("_")
-        data[k][int(i)] = j
-        data[k][int(j)] = f"@{i}"
-    return pd.DataFrame(data)
+    # parse_sol only keeps x variables, so names are "x_i_j_k".
+    ijk = [var[2:].split("_", 2) for var, val in sol.items() if val != 0]
+    i, j, k = np.array(ijk, dtype=int).reshape(-1, 3).T
+    # Opponent of each team in each round, -1 if there is none.
+    opponent = np.full((n, 2 * (n - 1)), -1)
+    home = np.zeros((n, 2 * (n - 1)), dtype=bool)
+    opponent[i, k] = j
+    home[i, k] = True
+    opponent[j, k] = i
+    home[j, k] = False
+    # Labels are formatted once per team, the last entry is picked up by -1.
+    home_label = np.array([str(t) for t in range(n)] + [""], dtype=object)
+    away_label = np.array([f"@{t}" for t in range(n)] + [""], dtype=object)
+    fixture = np.where(home, home_label[opponent], away_label[opponent])
+    # The preallocated fixture becomes the round columns as is, without copying it to lists.
+    df = pd.DataFrame(fixture, columns=[str(r) for r in range(2 * (n - 1))])
+    df.insert(0, "Team", [x for x in range(n)])
+    return df
 
 
 def to_df_mapped(
@@ -59,14 +63,14 @@ def to_df_mapped(
 
     """
     df = to_df(len(country_of), sol)
+    # Every cell is "", a team index or "@" and a team index, so one lookup maps them all.
+    labels = {"": ""}
+    for i, country in country_of.items():
+        labels[i] = country
+        labels[f"@{i}"] = f"@{country}"
     # Replace numeric team indices with country names
-    df["Team"] = [country_of[str(i)] for i in df["Team"]]
+    data = dict()
+    data["Team"] = [country_of[str(i)] for i in df["Team"]]
     for col in df.columns[1:]:
-        df[col] = df[col].apply(
-            lambda v: (
-                f"@{country_of[v[1:]]}"
-                if isinstance(v, str) and v.startswith("@")
-                else (country_of[v] if v != "" else "")
-            )
-        )
-    return df
+        data[col] = [labels[v] for v in df[col].tolist()]
+    return pd.DataFrame(data)